@@ -10,6 +10,7 @@ logs will use subtle colors and formatting (spacing/indentation) to make it easi
 """
 
 import logging
+import logging.handlers
 import sys
 
 from colorama import (  # Fore allows for specific colors & Style allows for specific styles (bold, underline, etc)
@@ -38,6 +39,20 @@ LOG_INDENT = {
     'ERROR': '    '
 }
 
+# Buffering for file logs -> batch small writes into larger chunks
+FILE_BUFFER_SIZE = 64 * 1024    # 64 KiB stream buffer for the log file
+MEMORY_CAPACITY = 1024          # records held before flushing to the file handler
+
+# Precompute one prefix per level, keyed by levelno (records carry levelno,
+# not the level name, so the old per-record lookups always missed)
+LOG_PREFIX = {
+    getattr(logging, level): LOG_COLORS[level] + LOG_STYLES[level] + LOG_INDENT[level]
+    for level in LOG_COLORS
+}
+
+# Shared log line layout for console & file output
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(filename)s - %(message)s'
+
 # create new formatter class (CustomFormatter) that inherits from logging.Formatter
 class CustomFormatter(logging.Formatter):
     """
@@ -47,46 +62,64 @@ class CustomFormatter(logging.Formatter):
     
     # override the format method
     def format(self, record):
-        log_color = LOG_COLORS.get(record.levelno, "")      # get color for log level
-        log_style = LOG_STYLES.get(record.levelno, "")      # get style for log level
-        log_indent = LOG_INDENT.get(record.levelno, "")     # get indent for log level
-        
-        # set log message format 
-        log_msg = f"{log_color}{log_style}{log_indent}{record.asctime} - {record.levelname} - {record.filename} - {record.message}{Style.RESET_ALL}"
-
-        return log_msg
+        # one dict lookup for the precomputed color+style+indent prefix
+        log_msg = super().format(record)
+        return LOG_PREFIX.get(record.levelno, "") + log_msg + Style.RESET_ALL
     
     
 # create logger
 def setup_logger(log_file='logs.log'):
     """
-    Set up logger with custom formatter
+    Set up the root logger with custom formatter.
+    Handlers live on the root so every module logger inherits them via
+    propagation instead of each module needing its own handlers.
     """
-    
-    # create logger
-    logger = logging.getLogger(__name__)
+
+    # configure the root logger
+    logger = logging.getLogger()
+
+    # guard against re-running setup (module reload / double import path);
+    # duplicate handlers mean every record is formatted and written N times
+    if getattr(logger, '_stock_cli_configured', False):
+        return logger
+    logger.handlers[:] = []
+
     logger.setLevel(logging.DEBUG)  # cap all log lvl
     
     #format
-    file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(filename)s - %(message)s')
+    file_formatter = logging.Formatter(LOG_FORMAT)
     
-    #file handler
-    file_handler = logging.FileHandler(log_file)
+    #file handler -> buffered stream so each record isn't its own write() syscall
+    file_stream = open(log_file, 'a', buffering=FILE_BUFFER_SIZE)
+    file_handler = logging.StreamHandler(file_stream)
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+
+    # memory handler coalesces records into bulk writes; ERROR flushes immediately
+    memory_handler = logging.handlers.MemoryHandler(
+        MEMORY_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True
+    )
+    logger.addHandler(memory_handler)
     
     # console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
-    console_handler.setFormatter(CustomFormatter())
+    console_handler.setFormatter(CustomFormatter(LOG_FORMAT))
     logger.addHandler(console_handler)
-    
+
+    logger._stock_cli_configured = True
     return logger
 
-# access point for logger 
-def get_logger():
-    return logging.getLogger(__name__)
+# access point for logger
+def get_logger(name=None):
+    """
+    Return a logger for the calling module; records propagate to the
+    handlers attached to the root logger by setup_logger.
+    """
+    return logging.getLogger(name)
 
 #Init
 logger = setup_logger()
@@ -30,6 +30,12 @@ import os
 import datetime
 import json
 from yahooquery import Ticker  # More reliable than scraping HTML
+
+try:
+    import orjson  # faster C-extension JSON when available
+except ImportError:
+    orjson = None
+
 from logs.logging import get_logger
 
 # Set up logger
@@ -43,149 +49,193 @@ DATA_DIR = "data"
 os.makedirs(DATA_DIR, exist_ok=True)
 DATA_FILE = os.path.join(DATA_DIR, "stock_data.json")
 
-def fetch_live_data(ticker):
+def fetch_live_data(stock, tickers):
     """
-    Fetch live stock data for a given ticker using yahooquery.
-    
+    Fetch live stock data for all tickers from a bulk yahooquery Ticker.
+
     Args:
-    - ticker (str): Stock ticker symbol.
-    
+    - stock (Ticker): Bulk Ticker object built from the full ticker list.
+    - tickers (list): Stock ticker symbols.
+
     Returns:
-    - dict: Live stock data with price, change, percentage change, and timestamp.
+    - dict: Live stock data per ticker with price, change, percentage change, and timestamp.
     """
+    results = {}
     try:
-        stock = Ticker(ticker)
-        market_data = stock.price.get(ticker, {})
-        live_data = {
-            'price': market_data.get('regularMarketPrice'),
-            'change': market_data.get('regularMarketChange'),
-            'percent_change': market_data.get('regularMarketChangePercent'),
-            'timestamp': datetime.datetime.now().isoformat()
-        }
-        logger.info(f"Live data for {ticker}: {json.dumps(live_data, default=str)}")
-        return live_data
+        price_data = stock.price
+        for ticker in tickers:
+            market_data = price_data.get(ticker, {})
+            results[ticker] = {
+                'price': market_data.get('regularMarketPrice'),
+                'change': market_data.get('regularMarketChange'),
+                'percent_change': market_data.get('regularMarketChangePercent'),
+                'timestamp': datetime.datetime.now().isoformat()
+            }
+            logger.info(f"Live data for {ticker}: {json.dumps(results[ticker], default=str)}")
     except Exception as e:
-        logger.error(f"Error fetching live data for {ticker}: {e}")
-        return {}
+        logger.error(f"Error fetching live data: {e}")
+    return results
 
-def fetch_frequent_data(ticker):
+def fetch_frequent_data(stock, tickers):
     """
-    Fetch frequently updated stock data for a given ticker using yahooquery.
-    
+    Fetch frequently updated stock data for all tickers from a bulk yahooquery Ticker.
+
     Args:
-    - ticker (str): Stock ticker symbol.
-    
+    - stock (Ticker): Bulk Ticker object built from the full ticker list.
+    - tickers (list): Stock ticker symbols.
+
     Returns:
-    - dict: Frequently updated stock data.
+    - dict: Frequently updated stock data per ticker.
     """
+    results = {}
     try:
-        stock = Ticker(ticker)
-        summary_detail = stock.summary_detail.get(ticker, {})
-        frequent_data = {
-            'previous_close': summary_detail.get('previousClose'),
-            'open': summary_detail.get('open'),
-            'day_high': summary_detail.get('dayHigh'),
-            'day_low': summary_detail.get('dayLow'),
-            'volume': summary_detail.get('volume'),
-            'timestamp': datetime.datetime.now().isoformat()
-        }
-        logger.info(f"Frequent data for {ticker}: {json.dumps(frequent_data, default=str)}")
-        return frequent_data
+        summary_detail_data = stock.summary_detail
+        for ticker in tickers:
+            summary_detail = summary_detail_data.get(ticker, {})
+            results[ticker] = {
+                'previous_close': summary_detail.get('previousClose'),
+                'open': summary_detail.get('open'),
+                'day_high': summary_detail.get('dayHigh'),
+                'day_low': summary_detail.get('dayLow'),
+                'volume': summary_detail.get('volume'),
+                'timestamp': datetime.datetime.now().isoformat()
+            }
+            logger.info(f"Frequent data for {ticker}: {json.dumps(results[ticker], default=str)}")
     except Exception as e:
-        logger.error(f"Error fetching frequent data for {ticker}: {e}")
-        return {}
+        logger.error(f"Error fetching frequent data: {e}")
+    return results
 
-def fetch_infrequent_data(ticker):
+def fetch_infrequent_data(stock, tickers):
     """
-    Fetch infrequently updated stock data for a given ticker using yahooquery.
-    
+    Fetch infrequently updated stock data for all tickers from a bulk yahooquery Ticker.
+
     Args:
-    - ticker (str): Stock ticker symbol.
-    
+    - stock (Ticker): Bulk Ticker object built from the full ticker list.
+    - tickers (list): Stock ticker symbols.
+
     Returns:
-    - dict: Infrequently updated stock data.
+    - dict: Infrequently updated stock data per ticker.
     """
+    results = {}
     try:
-        stock = Ticker(ticker)
-        summary_profile = stock.summary_profile.get(ticker, {})
-        infrequent_data = {
-            'sector': summary_profile.get('sector'),
-            'industry': summary_profile.get('industry'),
-            'full_time_employees': summary_profile.get('fullTimeEmployees'),
-            'timestamp': datetime.datetime.now().isoformat()
-        }
-        logger.info(f"Infrequent data for {ticker}: {json.dumps(infrequent_data, default=str)}")
-        return infrequent_data
+        summary_profile_data = stock.summary_profile
+        for ticker in tickers:
+            summary_profile = summary_profile_data.get(ticker, {})
+            results[ticker] = {
+                'sector': summary_profile.get('sector'),
+                'industry': summary_profile.get('industry'),
+                'full_time_employees': summary_profile.get('fullTimeEmployees'),
+                'timestamp': datetime.datetime.now().isoformat()
+            }
+            logger.info(f"Infrequent data for {ticker}: {json.dumps(results[ticker], default=str)}")
     except Exception as e:
-        logger.error(f"Error fetching infrequent data for {ticker}: {e}")
-        return {}
+        logger.error(f"Error fetching infrequent data: {e}")
+    return results
 
-def fetch_general_data(ticker):
+def fetch_general_data(stock, tickers):
     """
-    Fetch general stock data for a given ticker using yahooquery.
-    
+    Fetch general stock data for all tickers from a bulk yahooquery Ticker.
+
     Args:
-    - ticker (str): Stock ticker symbol.
-    
+    - stock (Ticker): Bulk Ticker object built from the full ticker list.
+    - tickers (list): Stock ticker symbols.
+
     Returns:
-    - dict: General stock data.
+    - dict: General stock data per ticker.
     """
+    results = {}
     try:
-        stock = Ticker(ticker)
-        asset_profile = stock.asset_profile.get(ticker, {})
-        general_data = {
-            'long_business_summary': asset_profile.get('longBusinessSummary'),
-            'country': asset_profile.get('country'),
-            'website': asset_profile.get('website'),
-            'timestamp': datetime.datetime.now().isoformat()
-        }
-        # log output with general info but no dump bc it is too long
-        logger.info(f"General data for {ticker}")
-        return general_data
+        asset_profile_data = stock.asset_profile
+        for ticker in tickers:
+            asset_profile = asset_profile_data.get(ticker, {})
+            results[ticker] = {
+                'long_business_summary': asset_profile.get('longBusinessSummary'),
+                'country': asset_profile.get('country'),
+                'website': asset_profile.get('website'),
+                'timestamp': datetime.datetime.now().isoformat()
+            }
+            # log output with general info but no dump bc it is too long
+            logger.info(f"General data for {ticker}")
     except Exception as e:
-        logger.error(f"Error fetching general data for {ticker}: {e}")
-        return {}
+        logger.error(f"Error fetching general data: {e}")
+    return results
 
-def save_data(ticker, data):
+def load_existing_data():
     """
-    Save stock data to a JSON file.
-    
-    Args:
-    - ticker (str): Stock ticker symbol.
-    - data (dict): Stock data to save.
+    Load previously saved stock data from the JSON file, if any.
+
+    Returns:
+    - dict: All saved stock data keyed by ticker.
     """
     try:
         if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as file:
-                all_data = json.load(file)
-        else:
-            all_data = {}
+            with open(DATA_FILE, 'rb') as file:
+                payload = file.read()
+            if orjson is not None:
+                return orjson.loads(payload)
+            return json.loads(payload)
+    except Exception as e:
+        logger.error(f"Error loading existing data: {e}")
+    return {}
+
+def merge_into(all_data, ticker, data):
+    """
+    Merge one ticker's data into the in-memory data dict.
+
+    Args:
+    - all_data (dict): All stock data keyed by ticker.
+    - ticker (str): Stock ticker symbol.
+    - data (dict): Stock data to merge.
+    """
+    all_data[ticker] = data
+    logger.info(f"Data merged for {ticker}")
 
-        all_data[ticker] = data
+def save_data(all_data):
+    """
+    Save all stock data to the JSON file in a single write.
 
-        with open(DATA_FILE, 'w') as file:
-            json.dump(all_data, file, indent=4)
-        logger.info(f"Data saved for {ticker}")
+    Args:
+    - all_data (dict): All stock data keyed by ticker.
+    """
+    try:
+        if orjson is not None:
+            payload = orjson.dumps(all_data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(all_data, indent=4).encode('utf-8')
+        # single write to a temp file + rename -> no truncated file on crash
+        tmp_path = DATA_FILE + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, DATA_FILE)
+        logger.info(f"Data saved for {len(all_data)} tickers")
     except Exception as e:
-        logger.error(f"Error saving data for {ticker}: {e}")
+        logger.error(f"Error saving data: {e}")
 
 def main():
     logger.info("...Starting data collection...")
+    # One bulk Ticker object -> 4 batched calls total instead of 4 per ticker
+    stock = Ticker(ticker_list)
+    live_data = fetch_live_data(stock, ticker_list)
+    frequent_data = fetch_frequent_data(stock, ticker_list)
+    infrequent_data = fetch_infrequent_data(stock, ticker_list)
+    general_data = fetch_general_data(stock, ticker_list)
+
+    # Load once, merge every ticker in memory, write once at the end
+    all_data = load_existing_data()
     for ticker in ticker_list:
-        logger.info(f"Collecting data for {ticker}")
-        live_data = fetch_live_data(ticker)
-        frequent_data = fetch_frequent_data(ticker)
-        infrequent_data = fetch_infrequent_data(ticker)
-        general_data = fetch_general_data(ticker)
-
         combined_data = {
-            'live_data': live_data,
-            'frequent_data': frequent_data,
-            'infrequent_data': infrequent_data,
-            'general_data': general_data
+            'live_data': live_data.get(ticker, {}),
+            'frequent_data': frequent_data.get(ticker, {}),
+            'infrequent_data': infrequent_data.get(ticker, {}),
+            'general_data': general_data.get(ticker, {})
         }
 
-        save_data(ticker, combined_data)
+        merge_into(all_data, ticker, combined_data)
+    save_data(all_data)
     logger.info("...Data collection complete...")
 
 if __name__ == "__main__":
@@ -2,16 +2,15 @@
 
 """
 Description:
-- Practice using yfinance to get stock data
+- Practice fetching recent stock data with yahooquery (replaced yfinance)
     - Get stock data for a specific date range, particularly most recent data possible
-- figure all data received from yfinance and how to use it to plan database schema
+- figure all data received from the API and how to use it to plan database schema
 """
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), os.path.pardir))
-import datetime
 
-import yfinance as yf
+from yahooquery import Ticker
 
 from logs.logging import get_logger
 
@@ -19,38 +18,38 @@ from logs.logging import get_logger
 logger = get_logger()
 
 
-# get most recent data for a stock
-def get_recent_data(ticker):
-    logger.info(f"Getting recent data for {ticker}")
-    
-    # get up to date data -> set time to now
-    now = datetime.datetime.now()
-    
-    # fetch data
-    data = yf.download(ticker, start=now, end=now)
-    
+# get most recent data for all test stocks in one batched call
+def get_recent_data(tickers):
+    logger.info(f"Getting recent data for {tickers}")
+
+    # one batched history call for the whole list -> single HTTP round-trip
+    data = Ticker(tickers).history(period='1d', interval='1m')
+
     # check if data is empty
     if data.empty:
-        logger.error(f"No data found for {ticker}")
+        logger.error(f"No data found for {tickers}")
         return None
-    
-    # Remove redundant ticker name from column headers
-    data.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
 
-    # Format and log stock data
-    formatted_data = data.reset_index()
-    formatted_data_str = formatted_data.to_string(index=False)
-    
-    logger.info(f"\n=== {ticker} Data ===\n{formatted_data_str}\n")
-    return formatted_data
+    results = {}
+    for ticker in tickers:
+        if ticker not in data.index.levels[0]:
+            logger.error(f"No data found for {ticker}")
+            continue
+
+        # Pull this ticker's rows out of the MultiIndex frame
+        formatted_data = data.xs(ticker, level=0).reset_index()
+        formatted_data_str = formatted_data.to_string(index=False)
+
+        logger.info(f"\n=== {ticker} Data ===\n{formatted_data_str}\n")
+        results[ticker] = formatted_data
+    return results
 
 
 def main():
     test_tickers = ['AAPL', 'MSFT', 'TSLA']
-    for ticker in test_tickers:
-        get_recent_data(ticker)
+    get_recent_data(test_tickers)
     logger.info("End of test run")
-    
+
 if __name__ == "__main__":
     logger.info("Starting test run")
     main()
@@ -1,18 +1,104 @@
 # cli.py
 
+import itertools
 import sqlite3
+import sys
+import threading
+
 import click
 import os
 from logs.logging import get_logger
 
-# Import the new function to refresh just one ticker
-from db_ingest import fetch_and_store_live_for_ticker
+# Import the new function to refresh just one ticker, plus the process-wide
+# cached connection
+from db_ingest import fetch_and_store_live_for_ticker, get_conn
 
 logger = get_logger()
 
 # Adjust if your DB is stored elsewhere
 DB_FILE = os.path.join("data", "stock_data.db")
 
+# Stable SQL text at module scope -> the connection's statement cache is
+# keyed on the exact string, so repeat invocations skip sqlite's prepare.
+# We reference 'LiveData' (capital L) to match the table and JOIN on
+# Ticker to get the symbol.
+LIVE_SELECT_SQL = """
+SELECT t.symbol, l.price, l.change, l.percent_change, l.timestamp
+  FROM LiveData l
+  JOIN Ticker t ON t.id = l.ticker_id
+ WHERE t.symbol = ?
+ORDER BY l.id DESC
+ LIMIT 1
+"""
+
+# Latest live row per ticker, using SQLite's bare-column-with-MAX()
+# semantics: the non-aggregated columns come from the MAX(id) row of each
+# group, so the grouped subquery walks the (ticker_id, id DESC) index once
+# with no second probe back into LiveData.
+SNAPSHOT_SQL = """
+SELECT t.symbol, l.price, l.change, l.percent_change, l.timestamp
+  FROM Ticker t
+  JOIN (SELECT ticker_id, MAX(id) AS id, price, change, percent_change, timestamp
+          FROM LiveData
+         GROUP BY ticker_id) l
+    ON l.ticker_id = t.id
+ ORDER BY t.symbol
+"""
+
+# Color support is probed once at import rather than per click.secho call;
+# the cached prefixes are empty strings when output is piped, so the same
+# format path serves both cases with no per-line branching.
+_USE_COLOR = sys.stdout.isatty()
+_COLOR_UP = click.style("", fg="green", reset=False) if _USE_COLOR else ""
+_COLOR_DOWN = click.style("", fg="red", reset=False) if _USE_COLOR else ""
+_COLOR_RESET = "\x1b[0m" if _USE_COLOR else ""
+
+# Precompiled snapshot row template: one C-level % substitution per row
+# instead of re-evaluating an f-string's format specs every iteration
+_SNAPSHOT_ROW_FMT = "%-8s %10s %s%10s %9s%%%s  %s"
+
+# Spinner only appears for work that outlasts this delay; fast operations
+# never pay for stdout writes
+SPINNER_DELAY_SECONDS = 0.15
+SPINNER_INTERVAL_SECONDS = 0.2
+
+class _Spinner:
+    """
+    Lazy progress spinner for slow (network-bound) CLI operations.
+    Draws nothing when stdout is not a TTY, and the frame thread stays
+    silent until the wrapped work outlasts SPINNER_DELAY_SECONDS, so
+    sub-150ms operations finish before the first frame. Completion is
+    signalled via an Event rather than a shared flag poll.
+    """
+
+    def __init__(self, message="working"):
+        self.message = message
+        self._done = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if sys.stdout.isatty():
+            self._thread = threading.Thread(target=self._spin, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _spin(self):
+        # Lazy start: bail before drawing anything if the work is done
+        if self._done.wait(SPINNER_DELAY_SECONDS):
+            return
+        frames = itertools.cycle('|/-\\')
+        while not self._done.wait(SPINNER_INTERVAL_SECONDS):
+            sys.stdout.write(f"\r{self.message} {next(frames)}")
+            sys.stdout.flush()
+        # Clear the spinner line before normal output resumes
+        sys.stdout.write("\r" + " " * (len(self.message) + 2) + "\r")
+        sys.stdout.flush()
+
 @click.group()
 def cli():
     """Simple CLI for viewing and refreshing stock data."""
@@ -35,7 +121,8 @@ def live(ticker, refresh):
     if refresh:
         logger.info(f"Refreshing live data for {ticker} via db_ingest.")
         try:
-            fetch_and_store_live_for_ticker(DB_FILE, ticker)
+            with _Spinner(f"Refreshing {ticker}"):
+                fetch_and_store_live_for_ticker(DB_FILE, ticker)
             logger.info(f"Successfully refreshed live data for {ticker}.")
         except Exception as e:
             logger.error(f"Live data refresh failed for {ticker}: {e}")
@@ -44,33 +131,22 @@ def live(ticker, refresh):
     # 2) Query the database for the latest entry for this ticker
     logger.info(f"Fetching latest live data from DB for {ticker}")
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        # Notice we reference 'LiveData' (capital L) to match your table, 
-        # and we do a JOIN on Ticker to get the symbol
-        query = """
-        SELECT t.symbol, l.price, l.change, l.percent_change, l.timestamp
-          FROM LiveData l
-          JOIN Ticker t ON t.id = l.ticker_id
-         WHERE t.symbol = ?
-      ORDER BY l.id DESC
-         LIMIT 1
-        """
-
-        cursor.execute(query, (ticker,))
-        data = cursor.fetchone()
-        conn.close()
+        data = get_conn(DB_FILE).execute(LIVE_SELECT_SQL, (ticker,)).fetchone()
 
         if data:
             # data = (symbol, price, change, percent_change, timestamp)
-            click.echo("\n--- LIVE DATA ---")
-            click.echo(f" Ticker:         {data[0]}")
-            click.echo(f" Price:          {data[1]}")
-            click.echo(f" Change:         {data[2]}")
-            click.echo(f" Percent Change: {data[3]}%")
-            click.echo(f" Timestamp:      {data[4]}")
-            click.echo("---\n")
+            change = data[2]
+            tint = _COLOR_UP if (change or 0) >= 0 else _COLOR_DOWN
+            # one block, one write -> one syscall instead of per-line echoes
+            click.echo(
+                "\n--- LIVE DATA ---\n"
+                f" Ticker:         {data[0]}\n"
+                f" Price:          {data[1]}\n"
+                f" Change:         {tint}{change}{_COLOR_RESET}\n"
+                f" Percent Change: {tint}{data[3]}%{_COLOR_RESET}\n"
+                f" Timestamp:      {data[4]}\n"
+                "---\n"
+            )
         else:
             click.echo(f"No live data found in the DB for ticker='{ticker}'.")
     except Exception as e:
@@ -78,7 +154,37 @@ def live(ticker, refresh):
         click.echo(f"[ERROR] Unable to retrieve live data for {ticker}")
 
 
+@click.command()
+def snapshot():
+    """
+    Show the most recent live data for every ticker in the DB.
+    """
+    logger.info("CLI snapshot command called")
+    # Iterate the cursor directly: rows are formatted as sqlite produces
+    # them instead of first materializing the whole result via fetchall
+    lines = ["", f"{'Ticker':<8} {'Price':>10} {'Change':>10} {'% Change':>10}  Timestamp"]
+    try:
+        for symbol, price, change, percent_change, timestamp in get_conn(DB_FILE).execute(SNAPSHOT_SQL):
+            tint = _COLOR_UP if (change or 0) >= 0 else _COLOR_DOWN
+            lines.append(_SNAPSHOT_ROW_FMT % (
+                symbol, price, tint, change, percent_change, _COLOR_RESET, timestamp
+            ))
+    except Exception as e:
+        logger.error(f"Error fetching live snapshot: {e}")
+        click.echo("[ERROR] Unable to retrieve live data snapshot")
+        return
+
+    if len(lines) == 2:
+        click.echo("No live data found in the DB.")
+        return
+
+    lines.append("")
+    # Still one write for the whole table
+    click.echo("\n".join(lines))
+
+
 cli.add_command(live)
+cli.add_command(snapshot)
 
 if __name__ == "__main__":
     cli()
@@ -1,14 +1,15 @@
 import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
 from logs.logging import get_logger
 
-# Import your scraping functions
-from scrape import (
-    fetch_live_data, 
-    fetch_daily_data, 
-    fetch_fundamental_data, 
-    fetch_analysis_data,
-)
+# The scrape/yahooquery imports are deferred to the functions that fetch:
+# they drag in the whole HTTP stack, which DB-only paths (the CLI read
+# commands importing this module) never need. After the first fetch the
+# imports are sys.modules cache hits.
 
 logger = get_logger()
 
@@ -73,7 +74,7 @@ CREATE TABLE IF NOT EXISTS Analysis (
 
 CREATE TABLE IF NOT EXISTS RecommendationTrend (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    analysis_id INTEGER,
+    analysis_id INTEGER NOT NULL,
     period TEXT,
     strongBuy INTEGER,
     buy INTEGER,
@@ -85,7 +86,7 @@ CREATE TABLE IF NOT EXISTS RecommendationTrend (
 
 CREATE TABLE IF NOT EXISTS EarningsTrend (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    analysis_id INTEGER,
+    analysis_id INTEGER NOT NULL,
     period TEXT,
     growth REAL,
     FOREIGN KEY (analysis_id) REFERENCES Analysis(id)
@@ -93,13 +94,40 @@ CREATE TABLE IF NOT EXISTS EarningsTrend (
 
 CREATE TABLE IF NOT EXISTS IndexTrend (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    analysis_id INTEGER,
+    analysis_id INTEGER NOT NULL,
     peRatio REAL,
     pegRatio REAL,
     FOREIGN KEY (analysis_id) REFERENCES Analysis(id)
 );
+
+-- Indexes backing the CLI's "latest live row for symbol" lookup:
+-- symbol resolves via the unique index, then (ticker_id, id DESC) serves
+-- the ORDER BY id DESC LIMIT 1 as a direct B-tree descent
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ticker_symbol ON Ticker(symbol);
+CREATE INDEX IF NOT EXISTS idx_livedata_ticker_id_desc ON LiveData(ticker_id, id DESC);
+
+-- One row per (ticker, fetch timestamp): re-running ingestion over the
+-- same fetch upserts instead of appending duplicate log rows
+CREATE UNIQUE INDEX IF NOT EXISTS idx_livedata_ticker_ts ON LiveData(ticker_id, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_dailydata_ticker_ts ON DailyData(ticker_id, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_fundamentals_ticker_ts ON Fundamentals(ticker_id, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_analysis_ticker_ts ON Analysis(ticker_id, timestamp);
+
+-- Seekable parent->child joins (and the upsert path's child deletes)
+-- instead of full child-table scans
+CREATE INDEX IF NOT EXISTS idx_rec_trend_aid ON RecommendationTrend(analysis_id);
+CREATE INDEX IF NOT EXISTS idx_earn_trend_aid ON EarningsTrend(analysis_id);
+CREATE INDEX IF NOT EXISTS idx_index_trend_aid ON IndexTrend(analysis_id);
 """
 
+# Bump whenever CREATE_TABLES_SQL changes so existing databases re-run the DDL
+SCHEMA_VERSION = 3
+
+# Tables covered by the (ticker_id, timestamp) uniqueness rule; v1
+# databases may hold duplicates that must be pruned before the unique
+# indexes can be created
+_UPSERT_TABLES = ("LiveData", "DailyData", "Fundamentals", "Analysis")
+
 
 def init_db(db_path: str):
     """
@@ -107,77 +135,203 @@ def init_db(db_path: str):
     Returns a connection object.
     """
     logger.info(f"Initializing database at {db_path}")
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.executescript(CREATE_TABLES_SQL)
-    conn.commit()
+    # Explicit statement cache so repeated INSERT text isn't re-parsed.
+    # isolation_level=None disables the Python layer's implicit short
+    # transactions; writers group work explicitly via transaction() below.
+    conn = sqlite3.connect(db_path, cached_statements=512, isolation_level=None)
+    # WAL + NORMAL sync: writers don't block readers and commits skip the
+    # full fsync-per-transaction cost of rollback journal mode. WAL leaves
+    # -wal/-shm sidecar files next to the .db; that's expected.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # Keep temp b-trees off disk and memory-map reads of the main db file
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    # 64 MiB page cache so the growing LiveData index stays hot, and a busy
+    # timeout so CLI reads wait out a concurrent ingest commit instead of
+    # raising 'database is locked'
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA busy_timeout=5000")
+    # Schema marker: skip parsing the whole DDL script on every open once
+    # the database is already at the current version
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        if 0 < version < 2:
+            # v1 -> v2: drop duplicate (ticker_id, timestamp) rows so the
+            # unique indexes below can be built, keeping the newest row
+            for table in _UPSERT_TABLES:
+                conn.execute(
+                    f"DELETE FROM {table} WHERE id NOT IN "
+                    f"(SELECT MAX(id) FROM {table} GROUP BY ticker_id, timestamp)"
+                )
+        conn.executescript(CREATE_TABLES_SQL)
+        # Populate sqlite_stat1 so the planner trusts the fresh indexes
+        conn.execute("ANALYZE")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    # Cheap incremental re-analyze when table shapes have drifted enough
+    # for the planner to care (no-op most opens)
+    conn.execute("PRAGMA optimize")
     return conn
 
 
-# -----------------------------
-# Helper Functions for Inserts
-# -----------------------------
-
-def get_or_create_ticker_id(conn, symbol):
-    """
-    Upsert a ticker symbol into Ticker table and return its id.
+@contextmanager
+def transaction(conn):
     """
-    # Insert the ticker symbol if it doesn't exist, else ignore
-    insert_sql = """
-        INSERT OR IGNORE INTO Ticker (symbol)
-        VALUES (?)
+    Group writes into one explicit transaction: BEGIN IMMEDIATE takes the
+    write lock up front (no deferred-lock upgrade mid-batch), COMMIT on
+    success, ROLLBACK on any exception so partial batches never land.
     """
-    cursor = conn.cursor()
-    cursor.execute(insert_sql, (symbol,))
-    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
 
-    # Retrieve the ticker_id
-    select_sql = "SELECT id FROM Ticker WHERE symbol = ?"
-    cursor.execute(select_sql, (symbol,))
-    row = cursor.fetchone()
-    return row[0] if row else None
 
+# Default database location, shared by the CLI and schedulers
+DB_FILE = "data/stock_data.db"
 
-def store_live_data(conn, ticker_id, data):
+# Cached connections, one per thread per path, kept open for the life of
+# the process. Reopening per call re-runs the PRAGMA setup and throws away
+# the prepared-statement cache; sqlite3 connections can't be shared across
+# threads by default, hence thread-local rather than a single global.
+_local = threading.local()
+
+
+def get_conn(db_path=DB_FILE):
     """
-    Insert a new row into LiveData table.
-    `data` should be a dict like: {
-       'price': ...,
-       'change': ...,
-       'percent_change': ...,
-       'timestamp': ...
-    }
+    Return this thread's cached connection to db_path, opening it (and
+    initializing the schema) on first use.
+    """
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        conn = conns[db_path] = init_db(db_path)
+    return conn
+
+
+# Bulk-insert SQL shared by the single-row store_* helpers and the
+# executemany batching in main()
+
+INSERT_LIVE_SQL = """
+    INSERT INTO LiveData
+        (ticker_id, price, change, percent_change, timestamp)
+    VALUES
+        (?, ?, ?, ?, ?)
+    ON CONFLICT(ticker_id, timestamp) DO UPDATE SET
+        price = excluded.price,
+        change = excluded.change,
+        percent_change = excluded.percent_change
+"""
+
+INSERT_DAILY_SQL = """
+    INSERT INTO DailyData
+        (ticker_id, open, previous_close, day_high, day_low, volume,
+         market_cap, trailing_pe, forward_pe, timestamp)
+    VALUES
+        (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(ticker_id, timestamp) DO UPDATE SET
+        open = excluded.open,
+        previous_close = excluded.previous_close,
+        day_high = excluded.day_high,
+        day_low = excluded.day_low,
+        volume = excluded.volume,
+        market_cap = excluded.market_cap,
+        trailing_pe = excluded.trailing_pe,
+        forward_pe = excluded.forward_pe
+"""
+
+INSERT_FUNDAMENTAL_SQL = """
+    INSERT INTO Fundamentals
+        (ticker_id, sector, industry, full_time_employees, country,
+         website, description, timestamp)
+    VALUES
+        (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(ticker_id, timestamp) DO UPDATE SET
+        sector = excluded.sector,
+        industry = excluded.industry,
+        full_time_employees = excluded.full_time_employees,
+        country = excluded.country,
+        website = excluded.website,
+        description = excluded.description
+"""
+
+INSERT_ANALYSIS_SQL = """
+    INSERT INTO Analysis
+        (ticker_id, computed_recommendation, pe_ratio, peg_ratio,
+         next_quarter_growth, timestamp)
+    VALUES
+        (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(ticker_id, timestamp) DO UPDATE SET
+        computed_recommendation = excluded.computed_recommendation,
+        pe_ratio = excluded.pe_ratio,
+        peg_ratio = excluded.peg_ratio,
+        next_quarter_growth = excluded.next_quarter_growth
+    RETURNING id
+"""
+
+INSERT_RECOMMEND_SQL = """
+    INSERT INTO RecommendationTrend
+        (analysis_id, period, strongBuy, buy, hold, sell, strongSell)
+    VALUES
+        (?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_EARNINGS_SQL = """
+    INSERT INTO EarningsTrend
+        (analysis_id, period, growth)
+    VALUES
+        (?, ?, ?)
+"""
+
+INSERT_INDEX_SQL = """
+    INSERT INTO IndexTrend
+        (analysis_id, peRatio, pegRatio)
+    VALUES
+        (?, ?, ?)
+"""
+
+INSERT_TICKER_SQL = """
+    INSERT OR IGNORE INTO Ticker (symbol)
+    VALUES (?)
+"""
+
+# Single-statement upsert-and-fetch (SQLite >= 3.35 for RETURNING; the
+# no-op DO UPDATE makes the conflicting row visible to RETURNING)
+UPSERT_TICKER_RETURNING_SQL = """
+    INSERT INTO Ticker (symbol) VALUES (?)
+    ON CONFLICT(symbol) DO UPDATE SET symbol = excluded.symbol
+    RETURNING id
+"""
+
+
+# -----------------------------
+# Helper Functions for Inserts
+# -----------------------------
+
+
+def live_row(ticker_id, data):
     """
-    insert_sql = """
-        INSERT INTO LiveData 
-            (ticker_id, price, change, percent_change, timestamp)
-        VALUES 
-            (?, ?, ?, ?, ?)
+    Build a LiveData parameter tuple from a fetched live-data dict.
     """
-    cursor = conn.cursor()
-    cursor.execute(insert_sql, (
+    return (
         ticker_id,
         data.get('price'),
         data.get('change'),
         data.get('percent_change'),
         data.get('timestamp')
-    ))
-    conn.commit()
+    )
 
 
-def store_daily_data(conn, ticker_id, data):
-    """
-    Insert a new row into DailyData table.
+def daily_row(ticker_id, data):
     """
-    insert_sql = """
-        INSERT INTO DailyData 
-            (ticker_id, open, previous_close, day_high, day_low, volume,
-             market_cap, trailing_pe, forward_pe, timestamp)
-        VALUES 
-            (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    Build a DailyData parameter tuple from a fetched daily-data dict.
     """
-    cursor = conn.cursor()
-    cursor.execute(insert_sql, (
+    return (
         ticker_id,
         data.get('open'),
         data.get('previous_close'),
@@ -188,23 +342,14 @@ def store_daily_data(conn, ticker_id, data):
         data.get('trailing_pe'),
         data.get('forward_pe'),
         data.get('timestamp')
-    ))
-    conn.commit()
+    )
 
 
-def store_fundamental_data(conn, ticker_id, data):
-    """
-    Insert a new row into Fundamentals table.
+def fundamental_row(ticker_id, data):
     """
-    insert_sql = """
-        INSERT INTO Fundamentals 
-            (ticker_id, sector, industry, full_time_employees, country, 
-             website, description, timestamp)
-        VALUES 
-            (?, ?, ?, ?, ?, ?, ?, ?)
+    Build a Fundamentals parameter tuple from a fetched fundamentals dict.
     """
-    cursor = conn.cursor()
-    cursor.execute(insert_sql, (
+    return (
         ticker_id,
         data.get('sector'),
         data.get('industry'),
@@ -213,8 +358,57 @@ def store_fundamental_data(conn, ticker_id, data):
         data.get('website'),
         data.get('description'),
         data.get('timestamp')
-    ))
-    conn.commit()
+    )
+
+def get_ticker_ids(conn, symbols):
+    """
+    Upsert all symbols into the Ticker table and return a {symbol: id} dict.
+    One executemany + one SELECT replaces a round-trip pair per symbol.
+    """
+    symbols = list(symbols)
+    conn.executemany(INSERT_TICKER_SQL, [(s,) for s in symbols])
+    placeholders = ','.join('?' * len(symbols))
+    rows = conn.execute(
+        f"SELECT symbol, id FROM Ticker WHERE symbol IN ({placeholders})",
+        symbols
+    ).fetchall()
+    return dict(rows)
+
+
+def get_or_create_ticker_id(conn, symbol):
+    """
+    Upsert a ticker symbol into Ticker table and return its id.
+    One RETURNING statement instead of an INSERT + SELECT round-trip pair.
+    """
+    row = conn.execute(UPSERT_TICKER_RETURNING_SQL, (symbol,)).fetchone()
+    return row[0]
+
+
+def store_live_data(conn, ticker_id, data):
+    """
+    Insert a new row into LiveData table.
+    `data` should be a dict like: {
+       'price': ...,
+       'change': ...,
+       'percent_change': ...,
+       'timestamp': ...
+    }
+    """
+    conn.execute(INSERT_LIVE_SQL, live_row(ticker_id, data))
+
+
+def store_daily_data(conn, ticker_id, data):
+    """
+    Insert a new row into DailyData table.
+    """
+    conn.execute(INSERT_DAILY_SQL, daily_row(ticker_id, data))
+
+
+def store_fundamental_data(conn, ticker_id, data):
+    """
+    Insert a new row into Fundamentals table.
+    """
+    conn.execute(INSERT_FUNDAMENTAL_SQL, fundamental_row(ticker_id, data))
 
 
 def store_analysis_data(conn, ticker_id, data):
@@ -227,36 +421,28 @@ def store_analysis_data(conn, ticker_id, data):
     full_data = analysis_dict.get('full_data', {})
     timestamp = analysis_dict.get('timestamp')
 
-    insert_analysis_sql = """
-        INSERT INTO Analysis 
-            (ticker_id, computed_recommendation, pe_ratio, peg_ratio, 
-             next_quarter_growth, timestamp)
-        VALUES 
-            (?, ?, ?, ?, ?, ?)
-    """
-    cursor = conn.cursor()
-    cursor.execute(insert_analysis_sql, (
+    # RETURNING gives the Analysis id whether the row was inserted fresh or
+    # upserted onto an existing (ticker_id, timestamp) row
+    analysis_id = conn.execute(INSERT_ANALYSIS_SQL, (
         ticker_id,
         summary.get('recommendation'),
         summary.get('pe_ratio'),
         summary.get('peg_ratio'),
         summary.get('next_quarter_growth'),
         timestamp
-    ))
-    conn.commit()
+    )).fetchone()[0]
 
-    analysis_id = cursor.lastrowid  # capture the newly inserted Analysis id
+    # Re-ingesting the same fetch upserts the parent above; clear any child
+    # rows from the earlier pass so they aren't duplicated
+    conn.execute("DELETE FROM RecommendationTrend WHERE analysis_id = ?", (analysis_id,))
+    conn.execute("DELETE FROM EarningsTrend WHERE analysis_id = ?", (analysis_id,))
+    conn.execute("DELETE FROM IndexTrend WHERE analysis_id = ?", (analysis_id,))
 
-    # Store recommendation trend
+    # Store recommendation trend -- analysis_id is constant per ticker, so
+    # the child rows batch into one executemany instead of a per-row execute
     recommendation_list = full_data.get('recommendation_trend', [])
-    insert_recommend_sql = """
-        INSERT INTO RecommendationTrend
-            (analysis_id, period, strongBuy, buy, hold, sell, strongSell)
-        VALUES
-            (?, ?, ?, ?, ?, ?, ?)
-    """
-    for rec_row in recommendation_list:
-        cursor.execute(insert_recommend_sql, (
+    conn.executemany(INSERT_RECOMMEND_SQL, [
+        (
             analysis_id,
             rec_row.get('period'),
             rec_row.get('strongBuy'),
@@ -264,63 +450,67 @@ def store_analysis_data(conn, ticker_id, data):
             rec_row.get('hold'),
             rec_row.get('sell'),
             rec_row.get('strongSell'),
-        ))
+        )
+        for rec_row in recommendation_list
+    ])
 
     # Store earnings trend
     earnings_dict = full_data.get('earnings_trend', {})
     trend_list = earnings_dict.get('trend', [])
-    insert_earnings_sql = """
-        INSERT INTO EarningsTrend
-            (analysis_id, period, growth)
-        VALUES
-            (?, ?, ?)
-    """
-    for e_row in trend_list:
-        cursor.execute(insert_earnings_sql, (
-            analysis_id,
-            e_row.get('period'),
-            e_row.get('growth'),
-        ))
+    conn.executemany(INSERT_EARNINGS_SQL, [
+        (analysis_id, e_row.get('period'), e_row.get('growth'))
+        for e_row in trend_list
+    ])
 
     # Store index trend
     index_dict = full_data.get('index_trend', {})
-    insert_index_sql = """
-        INSERT INTO IndexTrend
-            (analysis_id, peRatio, pegRatio)
-        VALUES
-            (?, ?, ?)
-    """
     if index_dict:
-        cursor.execute(insert_index_sql, (
+        conn.execute(INSERT_INDEX_SQL, (
             analysis_id,
             index_dict.get('peRatio'),
             index_dict.get('pegRatio'),
         ))
-    conn.commit()
+
+def ingest_live_only(conn, tickers):
+    """
+    Fetch and store *only* live data for a list of tickers, reusing an
+    already-open connection. This is the lightweight recurring-update
+    path: one bulk Yahoo call, one transaction, no daily/fundamental/
+    analysis fetches and no connection churn per tick.
+    """
+    from scrape import fetch_live_data, get_ticker
+
+    live_data = fetch_live_data(get_ticker(tickers), tickers)
+    with transaction(conn):
+        symbol_to_id = get_ticker_ids(conn, tickers)
+        conn.executemany(INSERT_LIVE_SQL, (
+            live_row(symbol_to_id[tkr], data)
+            for tkr, data in live_data.items() if tkr in symbol_to_id
+        ))
+    logger.info(f"Stored live data for {len(live_data)} tickers.")
+
 
 # -----------------------------
-# New function to fetch/store live data for 1 ticker
+# CLI refresh helpers
 # -----------------------------
 
-def fetch_and_store_live_for_ticker(db_path, ticker):
-    """
-    Fetch *only* the live data for a single ticker, then store in DB.
-    This helps the CLI quickly refresh a single ticker's live data.
-    """
-    logger.info(f"Fetching live data for single ticker '{ticker}'")
-    conn = init_db(db_path)
-    ticker_data = fetch_live_data([ticker])  # returns a dict { ticker: {...} }
-    
-    if ticker in ticker_data:
-        # find or create the Ticker row
-        t_id = get_or_create_ticker_id(conn, ticker)
-        # store the live data
-        store_live_data(conn, t_id, ticker_data[ticker])
-        logger.info(f"Stored latest live data for '{ticker}' in DB.")
-    else:
-        logger.warning(f"No live data returned for '{ticker}'")
-    
-    conn.close()
+def fetch_and_store_live_for_tickers(db_path, tickers, conn=None):
+    """
+    Fetch *only* the live data for a list of tickers (one bulk Yahoo call)
+    and store it in a single transaction. Pass `conn` to use a specific
+    connection; otherwise this thread's cached connection is used.
+    """
+    logger.info(f"Fetching live data for {len(tickers)} ticker(s)")
+    if conn is None:
+        conn = get_conn(db_path)
+    ingest_live_only(conn, tickers)
+
+
+def fetch_and_store_live_for_ticker(db_path, ticker, conn=None):
+    """
+    Single-ticker convenience wrapper over fetch_and_store_live_for_tickers.
+    """
+    fetch_and_store_live_for_tickers(db_path, [ticker], conn=conn)
 
 # -----------------------------
 # Main Execution
@@ -334,6 +524,14 @@ def main():
       - Storing data into the DB
     """
     logger.info("Starting DB ingest process...")
+    from scrape import (
+        fetch_live_data,
+        fetch_daily_data,
+        fetch_fundamental_data,
+        fetch_analysis_data,
+        get_ticker,
+    )
+
     # Example large list of tickers
     ticker_list = [
         "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META", "NVDA", "JPM",
@@ -342,45 +540,65 @@ def main():
         # ... potentially many more
     ]
 
-    db_path = "data/stock_data.db"
-    conn = init_db(db_path)
+    conn = get_conn()
 
     start_time = time.time()
 
-    # 1) Fetch Data
+    # 1) Fetch Data (one shared Ticker object, all four categories in
+    #    parallel -- each call just blocks on Yahoo HTTP I/O)
     logger.info(f"Fetching data for {len(ticker_list)} tickers.")
-    live_data = fetch_live_data(ticker_list)
-    daily_data = fetch_daily_data(ticker_list)
-    fundamental_data = fetch_fundamental_data(ticker_list)
-    analysis_data = fetch_analysis_data(ticker_list)
-
-    # 2) For each ticker, insert all data
-    #    NOTE: In a production scenario, you might wrap the entire loop in a 
-    #    transaction for better performance with large data sets.
-    all_tickers = set(ticker_list)
-    for tkr in all_tickers:
-        logger.info(f"Storing data for ticker='{tkr}' in DB.")
-        ticker_id = get_or_create_ticker_id(conn, tkr)
-        
-        # live_data[tkr] might not exist if an error occurred
-        if tkr in live_data:
-            store_live_data(conn, ticker_id, live_data[tkr])
-        
-        if tkr in daily_data:
-            store_daily_data(conn, ticker_id, daily_data[tkr])
-        
-        if tkr in fundamental_data:
-            store_fundamental_data(conn, ticker_id, fundamental_data[tkr])
-        
-        if tkr in analysis_data:
-            store_analysis_data(conn, ticker_id, analysis_data[tkr])
+    ticker_obj = get_ticker(ticker_list)
+    fetchers = {
+        'live': fetch_live_data,
+        'daily': fetch_daily_data,
+        'fundamentals': fetch_fundamental_data,
+        'analysis': fetch_analysis_data
+    }
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="ingest") as executor:
+        futures = {executor.submit(fn, ticker_obj, ticker_list): name
+                   for name, fn in fetchers.items()}
+        for future in as_completed(futures):
+            fetched[futures[future]] = future.result()
+
+    live_data = fetched['live']
+    daily_data = fetched['daily']
+    fundamental_data = fetched['fundamentals']
+    analysis_data = fetched['analysis']
+
+    # 2) Stream each category straight into its executemany inside a single
+    #    transaction. sqlite3 accepts generator iterables, so only one row
+    #    tuple is live at a time instead of a full per-table list. Analysis
+    #    still goes row-by-row because its child tables need the new
+    #    Analysis id.
+    # dict.fromkeys dedupes in one pass while keeping input order, so the
+    # ticker upsert walks the symbol index in a stable order instead of
+    # set-randomized hops
+    all_tickers = dict.fromkeys(ticker_list)
+    logger.info(f"Storing fetched data for {len(all_tickers)} tickers in DB.")
+    with transaction(conn):
+        # Resolve every ticker id up front instead of per-symbol round-trips
+        symbol_to_id = get_ticker_ids(conn, all_tickers)
+        # a category dict might miss a symbol if its fetch errored
+        conn.executemany(INSERT_LIVE_SQL, (
+            live_row(symbol_to_id[tkr], data)
+            for tkr, data in live_data.items() if tkr in symbol_to_id
+        ))
+        conn.executemany(INSERT_DAILY_SQL, (
+            daily_row(symbol_to_id[tkr], data)
+            for tkr, data in daily_data.items() if tkr in symbol_to_id
+        ))
+        conn.executemany(INSERT_FUNDAMENTAL_SQL, (
+            fundamental_row(symbol_to_id[tkr], data)
+            for tkr, data in fundamental_data.items() if tkr in symbol_to_id
+        ))
+        for tkr, data in analysis_data.items():
+            if tkr in symbol_to_id:
+                store_analysis_data(conn, symbol_to_id[tkr], data)
 
     total_time = time.time() - start_time
     logger.info(f"Data ingestion completed in {total_time:.2f}s")
 
-    conn.close()
-    logger.info("Database connection closed. Exiting...")
-
 
 if __name__ == "__main__":
     main()
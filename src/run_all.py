@@ -1,5 +1,5 @@
+import sched
 import time
-import schedule
 import subprocess
 import sys
 import threading
@@ -7,6 +7,8 @@ import signal
 
 from logs.logging import get_logger
 
+import db_ingest
+
 logger = get_logger()
 
 # ---------------------------------------------------------
@@ -24,8 +26,7 @@ TICKER_LIST = [
 # How often we update live data (in minutes)
 LIVE_UPDATE_INTERVAL_MINUTES = 5
 
-# Paths to our scripts
-DB_INGEST_SCRIPT = "src/db_ingest.py"
+# Path to the interactive CLI script
 CLI_SCRIPT = "src/cli.py"
 
 # ---------------------------------------------------------
@@ -34,7 +35,7 @@ CLI_SCRIPT = "src/cli.py"
 
 def run_full_ingest():
     """
-    Run the DB ingestion script which fetches and stores:
+    Run the full DB ingestion in-process, fetching and storing:
       - live data
       - daily data
       - fundamental data
@@ -43,41 +44,70 @@ def run_full_ingest():
     """
     logger.info("Starting full data ingestion (all categories)...")
     try:
-        subprocess.run([sys.executable, DB_INGEST_SCRIPT], check=True)
+        db_ingest.main()
         logger.info("Full data ingestion completed successfully.")
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         logger.error(f"Full data ingestion failed: {e}")
 
 # ---------------------------------------------------------
 # Recurring Live Data Updates
 # ---------------------------------------------------------
 
+# Guards against overlapping ingests if a tick fires while the previous
+# update is still running
+_ingest_lock = threading.Lock()
+
 def run_live_data_update():
     """
-    If you have a specialized "store_live_data_only" approach or
-    "fetch_and_store_live_for_ticker" in db_ingest.py, you can call it here.
-    For simplicity, we re-run the entire DB ingest, but that’s optional.
+    Refresh only the live data on each scheduled tick, in-process and on
+    the shared connection. The recurring tick doesn't need the daily/
+    fundamental/analysis fetches a full ingest pays for.
     """
+    if not _ingest_lock.acquire(blocking=False):
+        logger.info("Previous live data update still running; skipping this tick.")
+        return
     logger.info("Starting recurring live data update...")
     try:
-        subprocess.run([sys.executable, DB_INGEST_SCRIPT], check=True)
+        db_ingest.ingest_live_only(db_ingest.get_conn(), TICKER_LIST)
         logger.info("Live data update completed successfully.")
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         logger.error(f"Live data update failed: {e}")
+    finally:
+        _ingest_lock.release()
 
 # ---------------------------------------------------------
 # Scheduling Thread
 # ---------------------------------------------------------
 
+# Set to stop the scheduler thread and interrupt its sleep immediately
+_scheduler_stop = threading.Event()
+
+# Heap-based scheduler: next-event lookup stays O(log N) as more periodic
+# jobs are added, and there is no fixed-rate polling at all
+_scheduler = sched.scheduler(timefunc=time.monotonic)
+
+def _live_update_tick():
+    """
+    Run one live data update, then re-enter the job so it repeats at the
+    configured interval.
+    """
+    run_live_data_update()
+    if not _scheduler_stop.is_set():
+        _scheduler.enter(LIVE_UPDATE_INTERVAL_MINUTES * 60, 1, _live_update_tick)
+
 def schedule_runner():
     """
-    Runs pending scheduled jobs in a loop.
-    This function is meant to run on a background thread so the main thread
-    can handle user interaction (CLI).
+    Drains the scheduler on a background thread so the main thread can
+    handle user interaction (CLI). Between events it blocks on the stop
+    Event with the exact time until the next deadline, so there are no
+    fixed-rate wakeups and shutdown interrupts the wait immediately.
     """
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    while not _scheduler_stop.is_set():
+        delay = _scheduler.run(blocking=False)
+        if delay is None:
+            # queue drained (stop was requested mid-tick)
+            break
+        _scheduler_stop.wait(timeout=delay)
 
 # ---------------------------------------------------------
 # CLI Runner
@@ -114,8 +144,8 @@ def main():
     
     # 2) Schedule repeated updates for live data
     logger.info(f"Scheduling live data updates every {LIVE_UPDATE_INTERVAL_MINUTES} minutes.")
-    schedule.every(LIVE_UPDATE_INTERVAL_MINUTES).minutes.do(run_live_data_update)
-    
+    _scheduler.enter(LIVE_UPDATE_INTERVAL_MINUTES * 60, 1, _live_update_tick)
+
     # Start the scheduling loop in a separate daemon thread
     sched_thread = threading.Thread(target=schedule_runner, daemon=True)
     sched_thread.start()
@@ -123,13 +153,16 @@ def main():
     # 3) Run the CLI in the main thread
     run_cli()
 
-    # 4) If CLI exits, we shut down the script
+    # 4) If CLI exits, we shut down the script (wake the scheduler so it
+    #    stops immediately instead of finishing its sleep)
+    _scheduler_stop.set()
     logger.info("CLI has exited. Stopping run_all.py...")
 
 if __name__ == "__main__":
     # Optional: handle CTRL+C or other signals gracefully in the main process
     def handle_signal(sig, frame):
         logger.info(f"Received signal {sig}, exiting run_all.py...")
+        _scheduler_stop.set()
         sys.exit(0)
     signal.signal(signal.SIGINT, handle_signal)
     signal.signal(signal.SIGTERM, handle_signal)
@@ -13,12 +13,19 @@ DESCRIPTION:
 
 import datetime
 import json
+import logging
 import os
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import pandas as pd
 from yahooquery import Ticker
 
+try:
+    import orjson  # C-extension JSON, much faster than stdlib for big payloads
+except ImportError:
+    orjson = None
+
 from logs.logging import get_logger
 
 # Configuration
@@ -27,8 +34,50 @@ DATA_DIR = "data"                        # Directory for storing data
 os.makedirs(DATA_DIR, exist_ok=True)     # Create data directory if it doesn't exist
 DATA_FILE = os.path.join(DATA_DIR, "stock_data.json")  # Path for storing data
 
+# Per-category refetch TTLs (seconds); 0 means always refetch.
+# Fundamentals shift over weeks and analysis over days, so scheduled runs
+# can skip most of the network I/O for them.
+CATEGORY_TTL = {
+    'live': 0,
+    'daily': 3600,
+    'fundamentals': 7 * 86400,
+    'analysis': 86400
+}
+
 logger = get_logger()
 
+# -----------------------------
+# Shared Ticker Objects
+# -----------------------------
+
+# Memoized bulk Ticker objects keyed by symbol set. Reusing the instance
+# keeps its underlying HTTP session (and thus TLS connections) warm across
+# scheduled refreshes instead of re-handshaking every Yahoo endpoint.
+_TICKER_CACHE = {}
+
+def get_ticker(symbols):
+    """
+    Return a cached asynchronous Ticker for this set of symbols (or one
+    bare symbol string), creating it on first use.
+    """
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    key = tuple(sorted(symbols))
+    ticker_obj = _TICKER_CACHE.get(key)
+    if ticker_obj is None:
+        ticker_obj = _TICKER_CACHE[key] = Ticker(
+            list(key),
+            asynchronous=True,
+            max_workers=16,
+            # yahooquery mounts a pooled HTTPAdapter from these: transient
+            # Yahoo hiccups (rate limits, gateway errors) get retried with
+            # exponential backoff instead of dropping the whole batch
+            retry=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+    return ticker_obj
+
 # -----------------------------
 # Data Cleaning / Defaults
 # -----------------------------
@@ -38,7 +87,8 @@ def safe_get(d, key, default=None):
     Safe dictionary get with optional default.
     """
     val = d.get(key, default)
-    logger.debug(f"safe_get: Looking for key='{key}', found='{val}', default='{default}'")
+    # %-style args are only formatted if a DEBUG handler actually fires
+    logger.debug("safe_get: Looking for key=%r, found=%r, default=%r", key, val, default)
     return val
 
 def clean_numeric(value, default=0.0):
@@ -49,7 +99,7 @@ def clean_numeric(value, default=0.0):
         result = float(value)
         return result
     except (TypeError, ValueError) as e:
-        logger.debug(f"clean_numeric: Unable to cast '{value}' to float, returning default='{default}' - {e}")
+        logger.debug("clean_numeric: Unable to cast %r to float, returning default=%r - %s", value, default, e)
         return default
 
 def clean_text(value, default=None):
@@ -58,7 +108,7 @@ def clean_text(value, default=None):
     """
     if isinstance(value, str) and value.strip():
         return value.strip()
-    logger.debug(f"clean_text: Using default='{default}' for value='{value}'")
+    logger.debug("clean_text: Using default=%r for value=%r", default, value)
     return default
 
 def clean_list(value, default=None):
@@ -67,119 +117,114 @@ def clean_list(value, default=None):
     """
     if isinstance(value, list):
         return value
-    logger.debug(f"clean_list: '{value}' is not a list, returning default='{default}' or empty list")
+    logger.debug("clean_list: %r is not a list, returning default=%r or empty list", value, default)
     return default or []
 
 # -----------------------------
-# Helper to chunk tickers
+# Fetch Functions (Shared Ticker)
 # -----------------------------
 
-def chunk_tickers(tickers, chunk_size=3):
+def fetch_live_data(ticker_obj, tickers):
     """
-    Yield successive chunks of size `chunk_size` from the ticker list.
-    """
-    for i in range(0, len(tickers), chunk_size):
-        yield tickers[i:i + chunk_size]
-
-# -----------------------------
-# Fetch Functions (Chunked)
-# -----------------------------
-
-def fetch_live_data(tickers):
-    """
-    Fetch live market data for tickers in chunks of 3.
+    Fetch live market data for tickers off a shared Ticker object.
     Returns a dict keyed by ticker.
     """
-    logger.info(f"Fetching live data for {len(tickers)} tickers in chunks of 3.")
+    logger.info(f"Fetching live data for {len(tickers)} tickers.")
     results = {}
-    # Break into chunks
-    for chunk in chunk_tickers(tickers, chunk_size=3):
-        logger.debug(f"Fetching live data chunk: {chunk}")
-        # Create a Ticker object for this chunk
-        ticker_obj = Ticker(chunk)
-        price_data = ticker_obj.price
-
-        for ticker in chunk:
-            try:
-                logger.debug(f"Fetching live data for ticker='{ticker}'.")
-                market_data = price_data.get(ticker, {})
-                # Build result with cleaning
-                results[ticker] = {
-                    'price': clean_numeric(safe_get(market_data, 'regularMarketPrice')),
-                    'change': clean_numeric(safe_get(market_data, 'regularMarketChange')),
-                    'percent_change': clean_numeric(safe_get(market_data, 'regularMarketChangePercent')),
-                    'timestamp': datetime.datetime.now().isoformat()
-                }
-                logger.info(f"Live data fetch successful for {ticker}")
-            except Exception as e:
-                logger.error(f"Error fetching live data for {ticker}: {e}")
+    # One timestamp per batch; all tickers in a call are fetched together
+    now_iso = datetime.datetime.now().isoformat()
+    # One batched request for the whole ticker list
+    price_data = ticker_obj.price
+    # Local bindings keep the per-field lookups out of the hot loop
+    _cn = clean_numeric
+
+    for ticker in tickers:
+        try:
+            logger.debug("Fetching live data for ticker='%s'.", ticker)
+            market_data = price_data.get(ticker, {})
+            # Build result with cleaning
+            results[ticker] = {
+                'price': _cn(market_data.get('regularMarketPrice')),
+                'change': _cn(market_data.get('regularMarketChange')),
+                'percent_change': _cn(market_data.get('regularMarketChangePercent')),
+                'timestamp': now_iso
+            }
+            logger.info(f"Live data fetch successful for {ticker}")
+        except Exception as e:
+            logger.error(f"Error fetching live data for {ticker}: {e}")
     return results
 
-def fetch_daily_data(tickers):
+def fetch_daily_data(ticker_obj, tickers):
     """
-    Fetch daily-level data for tickers in chunks of 3.
+    Fetch daily-level data for tickers off a shared Ticker object.
     """
-    logger.info(f"Fetching daily data for {len(tickers)} tickers in chunks of 3.")
+    logger.info(f"Fetching daily data for {len(tickers)} tickers.")
     results = {}
-    for chunk in chunk_tickers(tickers, chunk_size=3):
-        logger.debug(f"Fetching daily data chunk: {chunk}")
-        ticker_obj = Ticker(chunk)
-        summary_detail_data = ticker_obj.summary_detail
+    now_iso = datetime.datetime.now().isoformat()
+    summary_detail_data = ticker_obj.summary_detail
+    _cn = clean_numeric
 
-        for ticker in chunk:
-            try:
-                logger.debug(f"Fetching daily data for ticker='{ticker}'.")
-                summary_detail = summary_detail_data.get(ticker, {})
-                results[ticker] = {
-                    'open': clean_numeric(safe_get(summary_detail, 'open')),
-                    'previous_close': clean_numeric(safe_get(summary_detail, 'previousClose')),
-                    'day_high': clean_numeric(safe_get(summary_detail, 'dayHigh')),
-                    'day_low': clean_numeric(safe_get(summary_detail, 'dayLow')),
-                    'volume': int(clean_numeric(safe_get(summary_detail, 'volume'), default=0.0)),
-                    'market_cap': int(clean_numeric(safe_get(summary_detail, 'marketCap'), default=0.0)),
-                    'trailing_pe': clean_numeric(safe_get(summary_detail, 'trailingPE')),
-                    'forward_pe': clean_numeric(safe_get(summary_detail, 'forwardPE')),
-                    'timestamp': datetime.datetime.now().isoformat()
-                }
-                logger.info(f"Daily data fetch successful for {ticker}")
-                logger.debug(f"Daily data details for {ticker}: {results[ticker]}")
-            except Exception as e:
-                logger.error(f"Error fetching daily data for {ticker}: {e}")
+    for ticker in tickers:
+        try:
+            logger.debug("Fetching daily data for ticker='%s'.", ticker)
+            summary_detail = summary_detail_data.get(ticker, {})
+            results[ticker] = {
+                'open': _cn(summary_detail.get('open')),
+                'previous_close': _cn(summary_detail.get('previousClose')),
+                'day_high': _cn(summary_detail.get('dayHigh')),
+                'day_low': _cn(summary_detail.get('dayLow')),
+                'volume': int(_cn(summary_detail.get('volume'), default=0.0)),
+                'market_cap': int(_cn(summary_detail.get('marketCap'), default=0.0)),
+                'trailing_pe': _cn(summary_detail.get('trailingPE')),
+                'forward_pe': _cn(summary_detail.get('forwardPE')),
+                'timestamp': now_iso
+            }
+            logger.info(f"Daily data fetch successful for {ticker}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Daily data details for %s: %s", ticker, results[ticker])
+        except Exception as e:
+            logger.error(f"Error fetching daily data for {ticker}: {e}")
     return results
 
-def fetch_fundamental_data(tickers):
+def fetch_fundamental_data(ticker_obj, tickers):
     """
-    Fetch rarely changing fundamental info for tickers in chunks of 3.
+    Fetch rarely changing fundamental info for tickers off a shared Ticker object.
     """
-    logger.info(f"Fetching fundamental data for {len(tickers)} tickers in chunks of 3.")
+    logger.info(f"Fetching fundamental data for {len(tickers)} tickers.")
     results = {}
-    for chunk in chunk_tickers(tickers, chunk_size=3):
-        logger.debug(f"Fetching fundamental data chunk: {chunk}")
-        ticker_obj = Ticker(chunk)
-        asset_profile_data = ticker_obj.asset_profile
+    now_iso = datetime.datetime.now().isoformat()
+    asset_profile_data = ticker_obj.asset_profile
+    _cn = clean_numeric
+    _ct = clean_text
 
-        for ticker in chunk:
-            try:
-                logger.debug(f"Fetching fundamental data for ticker='{ticker}'.")
-                info = asset_profile_data.get(ticker, {})
-                results[ticker] = {
-                    'sector': clean_text(safe_get(info, 'sector')),
-                    'industry': clean_text(safe_get(info, 'industry')),
-                    'full_time_employees': int(clean_numeric(safe_get(info, 'fullTimeEmployees'), default=0.0)),
-                    'country': clean_text(safe_get(info, 'country')),
-                    'website': clean_text(safe_get(info, 'website')),
-                    'description': clean_text(safe_get(info, 'longBusinessSummary')),
-                    'timestamp': datetime.datetime.now().isoformat()
-                }
-                logger.info(f"Fundamental data fetch successful for {ticker}")
-            except Exception as e:
-                logger.error(f"Error fetching fundamental data for {ticker}: {e}")
+    for ticker in tickers:
+        try:
+            logger.debug("Fetching fundamental data for ticker='%s'.", ticker)
+            info = asset_profile_data.get(ticker, {})
+            results[ticker] = {
+                'sector': _ct(info.get('sector')),
+                'industry': _ct(info.get('industry')),
+                'full_time_employees': int(_cn(info.get('fullTimeEmployees'), default=0.0)),
+                'country': _ct(info.get('country')),
+                'website': _ct(info.get('website')),
+                'description': _ct(info.get('longBusinessSummary')),
+                'timestamp': now_iso
+            }
+            logger.info(f"Fundamental data fetch successful for {ticker}")
+        except Exception as e:
+            logger.error(f"Error fetching fundamental data for {ticker}: {e}")
     return results
 
-def fetch_analysis_data(tickers):
+# Labels indexed to match the fixed count order in interpret_recommendation
+REC_LABELS = ("Strong Buy", "Buy", "Hold", "Sell", "Strong Sell")
+
+# Shared fallback for missing lookups; avoids building a new dict per miss
+_EMPTY = {}
+
+def fetch_analysis_data(ticker_obj, tickers):
     """
-    Fetch multiple analysis-related endpoints in chunks of 3.
-    Each chunk returns data for 'recommendation_trend', 'earnings_trend', 'index_trend'.
+    Fetch multiple analysis-related endpoints off a shared Ticker object.
+    Uses 'recommendation_trend', 'earnings_trend', 'index_trend'.
     We then construct:
       'analysis': {
          'full_data': { ... all raw info ... },
@@ -187,144 +232,124 @@ def fetch_analysis_data(tickers):
          'timestamp': ...
       }
     """
-    logger.info(f"Fetching analysis data for {len(tickers)} tickers in chunks of 3.")
+    logger.info(f"Fetching analysis data for {len(tickers)} tickers.")
     results = {}
+    now_iso = datetime.datetime.now().isoformat()
 
-    for chunk in chunk_tickers(tickers, chunk_size=3):
-        logger.debug(f"Fetching analysis data chunk: {chunk}")
-        ticker_obj = Ticker(chunk)
+    # All three analysis modules come back from quoteSummary in ONE HTTP
+    # request per ticker; get_modules returns plain per-ticker dicts keyed
+    # by module name, so no DataFrame round-trip is needed either.
+    try:
+        modules_data = ticker_obj.get_modules(
+            'recommendationTrend earningsTrend indexTrend'
+        )
+        logger.debug("Successfully fetched fused analysis modules.")
+    except Exception as e:
+        logger.error(f"Error fetching analysis modules for {tickers}: {e}")
+        modules_data = {}
+
+    def _module(ticker_sym, name):
+        per_ticker = modules_data.get(ticker_sym)
+        if isinstance(per_ticker, dict):
+            return per_ticker.get(name, _EMPTY)
+        return _EMPTY
+
+    def interpret_recommendation(counts):
+        if not isinstance(counts, dict):
+            return "Unknown"
+        # Fixed-order tuple argmax; indexes straight into REC_LABELS
+        counts_t = (
+            counts.get('strongBuy', 0),
+            counts.get('buy', 0),
+            counts.get('hold', 0),
+            counts.get('sell', 0),
+            counts.get('strongSell', 0)
+        )
+        return REC_LABELS[max(range(5), key=counts_t.__getitem__)]
+
+    def process_recommendation_trend(modules, ticker_sym):
+        """
+        Return a dict with recommendation_trend data and a computed_recommendation.
+        """
+        module = modules.get(ticker_sym)
+        rec_list = []
+        if isinstance(module, dict):
+            rec_list = module.get('recommendationTrend', {}).get('trend', [])
+        if not rec_list:
+            logger.debug("No recommendation trend data found for ticker='%s'.", ticker_sym)
+            return {
+                'recommendation_trend': [],
+                'computed_recommendation': "No Data"
+            }
 
-        # Attempt to fetch each data set for this chunk
-        try:
-            rec_trend_df = ticker_obj.recommendation_trend
-            logger.debug("Successfully fetched recommendation_trend.")
-        except Exception as e:
-            logger.error(f"Error fetching recommendation_trend for chunk {chunk}: {e}")
-            rec_trend_df = pd.DataFrame()
+        # Usually '0m' is the current period; keyed lookup instead of a
+        # linear scan per ticker
+        by_period = {x.get('period'): x for x in rec_list}
+        row_0m = by_period.get('0m') or rec_list[0]
 
-        try:
-            earnings_data = ticker_obj.earnings_trend
-            logger.debug("Successfully fetched earnings_trend.")
-        except Exception as e:
-            logger.error(f"Error fetching earnings_trend for chunk {chunk}: {e}")
-            earnings_data = {}
+        recommendation = interpret_recommendation(row_0m)
+        return {
+            'recommendation_trend': rec_list,
+            'computed_recommendation': recommendation
+        }
 
-        try:
-            index_data = ticker_obj.index_trend
-            logger.debug(f"Index data: {index_data}")
-        except Exception as e:
-            logger.error(f"Error fetching index_trend for chunk {chunk}: {e}")
-            index_data = {}
-
-        def interpret_recommendation(counts):
-            if not isinstance(counts, dict):
-                return "Unknown"
-            label_map = {
-                'strongBuy': "Strong Buy",
-                'buy': "Buy",
-                'hold': "Hold",
-                'sell': "Sell",
-                'strongSell': "Strong Sell"
-            }
-            strong_buy = counts.get('strongBuy', 0)
-            buy = counts.get('buy', 0)
-            hold = counts.get('hold', 0)
-            sell = counts.get('sell', 0)
-            strong_sell = counts.get('strongSell', 0)
-            mapping = {
-                'strongBuy': strong_buy,
-                'buy': buy,
-                'hold': hold,
-                'sell': sell,
-                'strongSell': strong_sell
-            }
-            best_key = max(mapping, key=mapping.get)
-            return label_map.get(best_key, "Unknown")
-
-        def process_recommendation_trend(df, ticker_sym):
-            """
-            Return a dict with recommendation_trend data and a computed_recommendation.
-            """
-            if df.empty or ticker_sym not in df.index.levels[0]:
-                logger.debug(f"No recommendation trend data found for ticker='{ticker_sym}'.")
-                return {
-                    'recommendation_trend': [],
-                    'computed_recommendation': "No Data"
-                }
-            sub_df = df.xs(ticker_sym, level=0).copy()
-            sub_df.reset_index(drop=True, inplace=True)
-            rec_list = sub_df.to_dict(orient='records')
-
-            # Usually '0m' is the current period
-            row_0m = next((x for x in rec_list if x.get('period') == '0m'), None)
-            if row_0m is None and len(rec_list) > 0:
-                row_0m = rec_list[0]
-            elif row_0m is None:
-                row_0m = {}  # fallback
-
-            recommendation = interpret_recommendation(row_0m)
-            return {
-                'recommendation_trend': rec_list,
-                'computed_recommendation': recommendation
-            }
+    def create_summary(full_info):
+        """
+        Extract key fields from the full_info for a concise summary.
+        """
+        logger.debug("Creating summary from full_info for ticker.")
+        rec_recommendation = full_info.get('computed_recommendation', "Unknown")
+        idx_trend = full_info.get('index_trend', _EMPTY)
+        pe_ratio = idx_trend.get('peRatio')
+        peg_ratio = idx_trend.get('pegRatio')
+        ticker_earnings = full_info.get('earnings_trend', _EMPTY)
+        trend_list = ticker_earnings.get('trend', ())
+
+        by_period = {item.get('period'): item for item in trend_list}
+        next_q_growth = by_period.get('+1q', _EMPTY).get('growth')
+
+        summary = {
+            'recommendation': rec_recommendation,
+            'pe_ratio': pe_ratio,
+            'peg_ratio': peg_ratio,
+            'next_quarter_growth': next_q_growth
+        }
+        logger.debug("Summary created: %s", summary)
+        return summary
 
-        def create_summary(full_info):
-            """
-            Extract key fields from the full_info for a concise summary.
-            """
-            logger.debug("Creating summary from full_info for ticker.")
-            rec_recommendation = full_info.get('computed_recommendation', "Unknown")
-            idx_trend = full_info.get('index_trend', {})
-            pe_ratio = idx_trend.get('peRatio', None)
-            peg_ratio = idx_trend.get('pegRatio', None)
-            ticker_earnings = full_info.get('earnings_trend', {})
-            trend_list = ticker_earnings.get('trend', [])
-
-            next_quarter = next((item for item in trend_list if item.get('period') == '+1q'), {})
-            next_q_growth = next_quarter.get('growth')
-
-            summary = {
-                'recommendation': rec_recommendation,
-                'pe_ratio': pe_ratio,
-                'peg_ratio': peg_ratio,
-                'next_quarter_growth': next_q_growth
+    # Process for each ticker
+    for ticker in tickers:
+        try:
+            logger.debug("Fetching analysis data for ticker='%s'.", ticker)
+            rec_details = process_recommendation_trend(modules_data, ticker)
+            ticker_earnings = _module(ticker, 'earningsTrend')
+            ticker_index = _module(ticker, 'indexTrend')
+
+            full_analysis = {
+                'recommendation_trend': rec_details.get('recommendation_trend', []),
+                'computed_recommendation': rec_details.get('computed_recommendation', "Unknown"),
+                'earnings_trend': ticker_earnings,
+                'index_trend': ticker_index
             }
-            logger.debug(f"Summary created: {summary}")
-            return summary
+            simplified = create_summary(full_analysis)
 
-        # Process for each ticker in this chunk
-        for ticker in chunk:
-            try:
-                logger.debug(f"Fetching analysis data for ticker='{ticker}'.")
-                rec_details = process_recommendation_trend(rec_trend_df, ticker)
-                ticker_earnings = earnings_data.get(ticker, {})
-                ticker_index = index_data.get(ticker, {})
-
-                full_analysis = {
-                    'recommendation_trend': rec_details.get('recommendation_trend', []),
-                    'computed_recommendation': rec_details.get('computed_recommendation', "Unknown"),
-                    'earnings_trend': ticker_earnings,
-                    'index_trend': ticker_index
+            results[ticker] = {
+                'analysis': {
+                    'full_data': full_analysis,
+                    'summary': simplified,
+                    'timestamp': now_iso
                 }
-                simplified = create_summary(full_analysis)
-
-                results[ticker] = {
-                    'analysis': {
-                        'full_data': full_analysis,
-                        'summary': simplified,
-                        'timestamp': datetime.datetime.now().isoformat()
-                    }
-                }
-                logger.info(f"Analysis data fetch successful for {ticker}")
-            except Exception as e:
-                logger.error(f"Error processing analysis data for {ticker}: {e}")
-                results[ticker] = {
-                    'analysis': {
-                        'full_data': {},
-                        'summary': {'recommendation': "Error"},
-                        'timestamp': datetime.datetime.now().isoformat()
-                    }
+            }
+            logger.info(f"Analysis data fetch successful for {ticker}")
+        except Exception as e:
+            logger.error(f"Error processing analysis data for {ticker}: {e}")
+            results[ticker] = {
+                'analysis': {
+                    'full_data': {},
+                    'summary': {'recommendation': "Error"},
+                    'timestamp': now_iso
                 }
+            }
 
     return results
 
@@ -343,36 +368,64 @@ def combine_data_in_memory(live, daily, fundamentals, analysis):
     }
     """
     logger.info("Combining data from all fetched categories.")
-    combined = {}
-    all_tickers = set(live.keys()) | set(daily.keys()) | set(fundamentals.keys()) | set(analysis.keys())
-    logger.debug(f"Total tickers to combine: {len(all_tickers)}")
-
-    for t in all_tickers:
-        logger.debug(f"Combining data for ticker='{t}'")
-        combined[t] = {
-            'live': live.get(t, {}),
-            'daily': daily.get(t, {}),
-            'fundamentals': fundamentals.get(t, {})
-        }
-        if t in analysis:
-            combined[t].update(analysis[t])
+    # Single pass over each source dict: every ticker key is hashed once
+    # per category it appears in, with no union set or per-ticker re-probes
+    combined = defaultdict(lambda: {'live': {}, 'daily': {}, 'fundamentals': {}})
+    for category, source in (('live', live), ('daily', daily), ('fundamentals', fundamentals)):
+        for t, cat_data in source.items():
+            combined[t][category] = cat_data
+    for t, analysis_data in analysis.items():
+        combined[t].update(analysis_data)
+
+    logger.debug("Data combining complete for %d tickers.", len(combined))
+    return dict(combined)
+
+def loads_json(payload):
+    """
+    Decode JSON bytes, preferring orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
 
-    logger.debug("Data combining complete.")
-    return combined
+def dumps_json(data):
+    """
+    Encode data to indented JSON bytes, preferring orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=4).encode('utf-8')
+
+def write_atomic(filename, payload):
+    """
+    Write payload bytes in one write() via a temp file, then rename over
+    the target. A crash mid-write can never leave a truncated JSON file.
+    """
+    tmp_path = filename + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, filename)
 
-def save_data(data, filename):
+def save_data(data, filename, existing_data=None):
     """
     Save combined data to a JSON file, merging with any existing data.
+    Pass `existing_data` when the caller already loaded the file (e.g. for
+    the TTL checks) so the save doesn't read and decode it a second time.
     """
     logger.info(f"Saving data to '{filename}'.")
     try:
-        if os.path.exists(filename):
-            logger.debug("Existing data file found. Merging new data.")
-            with open(filename, 'r') as f:
-                existing_data = json.load(f)
-        else:
-            logger.debug("No existing data file found. Creating a new one.")
-            existing_data = {}
+        if existing_data is None:
+            if os.path.exists(filename):
+                logger.debug("Existing data file found. Merging new data.")
+                with open(filename, 'rb') as f:
+                    existing_data = loads_json(f.read())
+            else:
+                logger.debug("No existing data file found. Creating a new one.")
+                existing_data = {}
 
         for ticker, record in data.items():
             if ticker not in existing_data:
@@ -380,13 +433,51 @@ def save_data(data, filename):
             for category, cat_data in record.items():
                 existing_data[ticker][category] = cat_data
 
-        with open(filename, 'w') as f:
-            json.dump(existing_data, f, indent=4)
+        write_atomic(filename, dumps_json(existing_data))
 
         logger.info(f"Data saved successfully to {filename}")
     except Exception as e:
         logger.error(f"Error saving data to {filename}: {e}")
 
+# -----------------------------
+# TTL Cache Checks
+# -----------------------------
+
+def load_existing_data(filename):
+    """
+    Load the saved data file for TTL checks; empty dict when absent/bad.
+    """
+    if os.path.exists(filename):
+        try:
+            with open(filename, 'rb') as f:
+                return loads_json(f.read())
+        except Exception as e:
+            logger.error(f"Error loading existing data from {filename}: {e}")
+    return {}
+
+def stale_tickers(existing_data, category, tickers, now):
+    """
+    Return the subset of `tickers` whose saved `category` data is missing,
+    unparseable, or older than the category TTL. Only these need a fetch;
+    the rest are served from the saved file.
+    """
+    ttl = CATEGORY_TTL.get(category, 0)
+    if ttl <= 0:
+        return list(tickers)
+    stale = []
+    for ticker in tickers:
+        cat_data = existing_data.get(ticker, _EMPTY).get(category) or _EMPTY
+        saved_ts = cat_data.get('timestamp')
+        if saved_ts:
+            try:
+                age = (now - datetime.datetime.fromisoformat(saved_ts)).total_seconds()
+            except ValueError:
+                age = None
+            if age is not None and age < ttl:
+                continue
+        stale.append(ticker)
+    return stale
+
 # -----------------------------
 # Main Orchestration
 # -----------------------------
@@ -395,29 +486,59 @@ def main():
     logger.info("Starting stock data collection...")
     start_time = time.time()
 
-    # For demonstration, we fetch all categories
-    step_start_time = time.time()
-    live_data = fetch_live_data(ticker_list)
-    logger.info(f"Fetched live data in {time.time() - step_start_time:.2f}s")
-
-    step_start_time = time.time()
-    daily_data = fetch_daily_data(ticker_list)
-    logger.info(f"Fetched daily data in {time.time() - step_start_time:.2f}s")
-
-    step_start_time = time.time()
-    fundamental_data = fetch_fundamental_data(ticker_list)
-    logger.info(f"Fetched fundamental data in {time.time() - step_start_time:.2f}s")
+    # Reuse saved per-ticker category data that is still within its TTL
+    existing_data = load_existing_data(DATA_FILE)
+    now = datetime.datetime.now()
 
+    # Fetch all stale categories concurrently; each fetch blocks on network
+    # I/O, so threads overlap the independent HTTP waits. Only the stale
+    # subset of each category's tickers is requested from Yahoo -- the rest
+    # come straight from the saved file.
     step_start_time = time.time()
-    analysis_data = fetch_analysis_data(ticker_list)  # returns both 'full_data' and 'summary'
-    logger.info(f"Fetched analysis data in {time.time() - step_start_time:.2f}s")
+    fetchers = {
+        'live': fetch_live_data,
+        'daily': fetch_daily_data,
+        'fundamentals': fetch_fundamental_data,
+        'analysis': fetch_analysis_data  # returns both 'full_data' and 'summary'
+    }
+    fetched = {}
+    to_fetch = {}
+    for name, fn in fetchers.items():
+        stale = stale_tickers(existing_data, name, ticker_list, now)
+        stale_set = set(stale)
+        if name == 'analysis':
+            # analysis results are nested under an 'analysis' key
+            fetched[name] = {t: {'analysis': existing_data[t]['analysis']}
+                             for t in ticker_list if t not in stale_set}
+        else:
+            fetched[name] = {t: existing_data[t][name]
+                             for t in ticker_list if t not in stale_set}
+        if fetched[name]:
+            logger.info(f"Reusing cached {name} data for "
+                        f"{len(fetched[name])} tickers (within TTL).")
+        if stale:
+            to_fetch[name] = (fn, stale)
+
+    if to_fetch:
+        with ThreadPoolExecutor(max_workers=len(to_fetch)) as executor:
+            futures = {executor.submit(fn, get_ticker(stale), stale): name
+                       for name, (fn, stale) in to_fetch.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                fetched[name].update(future.result())
+                logger.info(f"Fetched {name} data after {time.time() - step_start_time:.2f}s")
+
+    live_data = fetched['live']
+    daily_data = fetched['daily']
+    fundamental_data = fetched['fundamentals']
+    analysis_data = fetched['analysis']
     
     step_start_time = time.time()
     combined_data = combine_data_in_memory(live_data, daily_data, fundamental_data, analysis_data)
     logger.info(f"Combined data in {time.time() - step_start_time:.2f}s")
 
     step_start_time = time.time()
-    save_data(combined_data, DATA_FILE)
+    save_data(combined_data, DATA_FILE, existing_data=existing_data)
     logger.info(f"Saved data in {time.time() - step_start_time:.2f}s")
 
     total_time = time.time() - start_time